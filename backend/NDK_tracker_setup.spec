@@ -53,7 +53,7 @@ a = Analysis(
         'ollama',
         'fastapi',
         'pydantic',
-        'requests',
+        'aiohttp',
         'jinja2',
         'markupsafe'
     ],
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Model downloader shared by the setup scripts.
+Fetches large files with several concurrent HTTP Range requests over one
+aiohttp session when the server supports them, and falls back to a single
+stream otherwise. Downloads go to a .part file next to the target and resume
+from where they stopped; the target only appears once the file is complete
+(and its SHA-256 matches, when known).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+import aiohttp
+
+# Large reads keep Python-level iterations and write() calls per MiB low
+CHUNK_SIZE = 1024 * 1024
+# Minimum seconds between progress redraws
+PROGRESS_INTERVAL = 0.5
+# Minimum seconds between resume-state saves
+STATE_SAVE_INTERVAL = 1.0
+# Concurrent range requests per download
+DEFAULT_CONNECTIONS = 8
+# Files smaller than this are not worth splitting
+MIN_SPLIT_SIZE = 16 * 1024 * 1024
+# Bytes hashed at each end of a file for its quick fingerprint
+FINGERPRINT_EDGE = 1024 * 1024
+# Transient failures (dropped connections, 429/5xx) are retried with exponential backoff
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# No overall deadline for a multi-hundred-MB file, but give up on a stalled socket
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+
+_SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class RangeNotSupported(Exception):
+    """Server answered a Range request with the full body"""
+
+
+class _ShortRead(IOError):
+    """Response body ended before the requested bytes arrived"""
+
+
+class _ProbeResult(NamedTuple):
+    total_size: int
+    accepts_ranges: bool
+    sha256: Optional[str]
+    # ETag, or Last-Modified when there is none: identifies the remote version
+    validator: Optional[str]
+    # Where the redirects end up (e.g. Hugging Face -> CDN)
+    final_url: str
+
+
+class _Progress:
+    """Byte counter that redraws whole-percent progress, at most every PROGRESS_INTERVAL.
+    The per-chunk cost is one integer compare; time and formatting only happen
+    when another percent has been crossed.
+    """
+
+    def __init__(self, total_size: int, downloaded: int = 0):
+        self._last_report = 0.0
+        self.reset(total_size, downloaded)
+
+    def reset(self, total_size: int, downloaded: int = 0):
+        self.total_size = total_size
+        self.downloaded = downloaded
+        self._step = max(total_size // 100, 1)
+        self._next_mark = (downloaded // self._step + 1) * self._step if total_size > 0 else None
+
+    def add(self, n: int):
+        self.downloaded += n
+        if self._next_mark is not None and self.downloaded >= self._next_mark:
+            self._next_mark = (self.downloaded // self._step + 1) * self._step
+            now = time.monotonic()
+            if now - self._last_report >= PROGRESS_INTERVAL:
+                self._last_report = now
+                self._print()
+
+    def finish(self):
+        if self.total_size > 0:
+            self._print()
+        print()
+
+    def _print(self):
+        print(f"\rProgress: {self.downloaded * 100 // self.total_size}%", end='', flush=True)
+
+
+class _ResumeState:
+    """Per-range progress of a .part file, persisted next to it as JSON.
+    Each range is [start, end, done]; bytes are counted only after they have
+    been written, so a saved state never claims more than is on disk.
+    """
+
+    def __init__(self, path: Path, url: str, total_size: int, validator: Optional[str],
+                 ranges: List[List[int]]):
+        self.path = path
+        self.url = url
+        self.total_size = total_size
+        self.validator = validator
+        self.ranges = ranges
+        self._last_save = 0.0
+
+    @classmethod
+    def load(cls, path: Path, url: str, total_size: int, validator: Optional[str]) -> Optional["_ResumeState"]:
+        """Load a saved state if it describes the same version of the remote file"""
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if (data.get("url"), data.get("total_size"), data.get("validator")) != (url, total_size, validator):
+            return None
+        return cls(path, url, total_size, validator, data["ranges"])
+
+    @property
+    def downloaded(self) -> int:
+        return sum(done for _, _, done in self.ranges)
+
+    def contiguous(self) -> int:
+        """Length of the fully written prefix of the file"""
+        for start, end, done in self.ranges:
+            if start + done <= end:
+                return start + done
+        return self.total_size
+
+    def advance(self, index: int, n: int):
+        self.ranges[index][2] += n
+        if time.monotonic() - self._last_save >= STATE_SAVE_INTERVAL:
+            self.save()
+
+    def save(self):
+        self._last_save = time.monotonic()
+        self.path.write_text(json.dumps({
+            "url": self.url,
+            "total_size": self.total_size,
+            "validator": self.validator,
+            "ranges": self.ranges,
+        }))
+
+
+class _PrefixHasher:
+    """SHA-256 of a file that is filled in out of order, fed as its prefix completes.
+    The bytes are read back while they are still in the page cache, so verifying
+    does not cost a second pass over the file from disk after the download.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.offset = 0
+        self._hash = hashlib.sha256()
+
+    def update_to(self, end: int):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while self.offset < end:
+                block = f.read(min(CHUNK_SIZE, end - self.offset))
+                if not block:
+                    break
+                self._hash.update(block)
+                self.offset += len(block)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+async def _hash_completed_prefix(hasher: _PrefixHasher, state: _ResumeState, stop: asyncio.Event):
+    while not stop.is_set():
+        target = state.contiguous()
+        if target > hasher.offset:
+            await asyncio.to_thread(hasher.update_to, target)
+        else:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+
+
+def _preallocate(f, size: int):
+    """Size the file up front; reserve real extents where the platform can"""
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            # One call instead of growing the file write by write: fewer metadata
+            # updates and less fragmentation for the later mmap
+            os.posix_fallocate(f.fileno(), 0, size)
+            return
+        except OSError:
+            # Not supported by this filesystem
+            pass
+    f.truncate(size)
+
+
+def _write_all(f, data: bytes):
+    # Unbuffered file objects may accept only part of a large write
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view):]
+
+
+def _retryable(exc: BaseException) -> bool:
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status in RETRY_STATUSES
+    return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError, _ShortRead))
+
+
+async def _with_retries(attempt):
+    """Await attempt() until it succeeds, retrying transient failures"""
+    for n in range(MAX_RETRIES + 1):
+        try:
+            return await attempt()
+        except Exception as e:
+            if n == MAX_RETRIES or not _retryable(e):
+                raise
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** n)
+
+
+async def _probe(session: aiohttp.ClientSession, url: str) -> _ProbeResult:
+    """HEAD the URL for its size, range support, version validator and (on Hugging Face) its SHA-256"""
+    async with session.head(url, allow_redirects=True) as response:
+        response.raise_for_status()
+        total_size = int(response.headers.get('content-length', 0))
+        accepts_ranges = response.headers.get('accept-ranges', '').lower() == 'bytes'
+        validator = response.headers.get('etag') or response.headers.get('last-modified')
+
+        # Hugging Face reports the LFS object's SHA-256 on the pre-redirect response
+        sha256 = None
+        for r in [*response.history, response]:
+            linked = r.headers.get('x-linked-etag', '').strip('"').lower()
+            if _SHA256_RE.match(linked):
+                sha256 = linked
+        final_url = str(response.url)
+    return _ProbeResult(total_size, accepts_ranges, sha256, validator, final_url)
+
+
+def _state_path(part: Path) -> Path:
+    """Resume-state sidecar of a .part file"""
+    return part.with_name(part.name + '.json')
+
+
+def _split(total_size: int, parts: int) -> List[List[int]]:
+    """Split [0, total_size) into [start, end, done] ranges with inclusive ends"""
+    step = -(-total_size // parts)
+    return [[start, min(start + step, total_size) - 1, 0] for start in range(0, total_size, step)]
+
+
+async def _download_range(session: aiohttp.ClientSession, url: str, part: Path,
+                          state: _ResumeState, index: int, progress: _Progress):
+    """Fetch the rest of one range into the .part file at the same offset.
+    Each attempt starts from the recorded progress, so a retry only refetches what is missing.
+    """
+    start, end, done = state.ranges[index]
+    offset = start + done
+    if offset > end:
+        return
+
+    headers = {'Range': f'bytes={offset}-{end}'}
+    # If the file changed since the probe the server sends it whole (200), which
+    # is caught below; weak ETags are not allowed in If-Range
+    if state.validator and not state.validator.startswith('W/'):
+        headers['If-Range'] = state.validator
+    async with session.get(url, headers=headers) as response:
+        response.raise_for_status()
+        if response.status != 206:
+            raise RangeNotSupported(f"Expected 206 Partial Content, got {response.status}")
+
+        # Each range has its own handle, so there is no shared file position;
+        # chunks are already 1 MiB, so an extra Python-level buffer would only add a copy
+        with open(part, 'r+b', buffering=0) as f:
+            f.seek(offset)
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                _write_all(f, chunk)
+                offset += len(chunk)
+                state.advance(index, len(chunk))
+                progress.add(len(chunk))
+
+    if offset != end + 1:
+        raise _ShortRead(f"Range {start}-{end} ended early at byte {offset}")
+
+
+async def _download_ranges(session: aiohttp.ClientSession, url: str, part: Path,
+                           state: _ResumeState, progress: _Progress, hash_file: bool) -> Optional[str]:
+    """Fetch all ranges; returns the file's SHA-256 when hash_file is set"""
+    tasks = [
+        asyncio.ensure_future(_with_retries(
+            lambda index=index: _download_range(session, url, part, state, index, progress)
+        ))
+        for index in range(len(state.ranges))
+    ]
+    hasher = _PrefixHasher(part) if hash_file else None
+    stop_hashing = asyncio.Event()
+    hash_task = asyncio.ensure_future(_hash_completed_prefix(hasher, state, stop_hashing)) if hasher else None
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the remaining ranges before the caller falls back or gives up
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        state.save()
+        if hash_task is not None:
+            # Let an in-flight block finish rather than cancelling mid-update
+            stop_hashing.set()
+            await hash_task
+
+    if hasher is None:
+        return None
+    await asyncio.to_thread(hasher.update_to, state.total_size)
+    return hasher.hexdigest()
+
+
+async def _download_single(session: aiohttp.ClientSession, url: str, part: Path, progress: _Progress) -> str:
+    """Stream the whole file in order, hashing it on the way; returns its SHA-256"""
+    # The .part file is rewritten from the start, so recorded ranges no longer
+    # describe it; a later run must not resume from them
+    _state_path(part).unlink(missing_ok=True)
+    h = hashlib.sha256()
+    async with session.get(url) as response:
+        response.raise_for_status()
+        # Without ranges a retry has to start over
+        progress.reset(progress.total_size or int(response.headers.get('content-length', 0)))
+
+        with open(part, 'wb', buffering=0) as f:
+            if progress.total_size:
+                _preallocate(f, progress.total_size)
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                _write_all(f, chunk)
+                h.update(chunk)
+                progress.add(len(chunk))
+
+    # The file was sized up front, so a short body would otherwise go unnoticed
+    if progress.total_size and progress.downloaded != progress.total_size:
+        raise _ShortRead(f"Download ended early at byte {progress.downloaded}")
+    return h.hexdigest()
+
+
+def _commit_part(part: Path, filepath: Path):
+    """Flush the finished .part file to disk, then atomically move it into place.
+    Without the fsync a crash shortly after the rename could leave a complete-looking
+    but partly empty model behind.
+    """
+    with open(part, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.replace(part, filepath)
+    if hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself (POSIX only; Windows can't open directories)
+        dir_fd = os.open(filepath.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _fingerprint_path(filepath: Path) -> Path:
+    return filepath.with_name(filepath.name + '.fingerprint.json')
+
+
+def _edge_sha256(filepath: Path, size: int) -> str:
+    """SHA-256 of the first and last FINGERPRINT_EDGE bytes"""
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        h.update(f.read(FINGERPRINT_EDGE))
+        if size > FINGERPRINT_EDGE:
+            f.seek(max(size - FINGERPRINT_EDGE, FINGERPRINT_EDGE))
+            h.update(f.read(FINGERPRINT_EDGE))
+    return h.hexdigest()
+
+
+def write_fingerprint(filepath: Path):
+    """Record size and edge hash of a known-good file next to it"""
+    size = filepath.stat().st_size
+    fingerprint = {"size": size, "edge_sha256": _edge_sha256(filepath, size)}
+    _fingerprint_path(filepath).write_text(json.dumps(fingerprint))
+
+
+def verify_fingerprint(filepath: Path) -> Optional[bool]:
+    """Cheap integrity check of a previously downloaded file.
+    Returns None when no fingerprint was recorded (e.g. a model copied in by hand).
+    """
+    try:
+        fingerprint = json.loads(_fingerprint_path(filepath).read_text())
+    except (OSError, ValueError):
+        return None
+    size = filepath.stat().st_size
+    return size == fingerprint.get("size") and _edge_sha256(filepath, size) == fingerprint.get("edge_sha256")
+
+
+async def _remote_size(url: str) -> Optional[int]:
+    async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as session:
+        probe = await _probe(session, url)
+    return probe.total_size or None
+
+
+def remote_size(url: str) -> Optional[int]:
+    """Size of the file at url per a HEAD request; None when it can't be determined (e.g. offline)"""
+    try:
+        return asyncio.run(_remote_size(url))
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError):
+        return None
+
+
+async def _download(url: str, filepath: Path, connections: int, sha256: Optional[str]):
+    part = filepath.with_name(filepath.name + '.part')
+    state_path = _state_path(part)
+
+    # One session for the probe and every range, so keep-alive connections are
+    # reused; the pool is sized to the number of ranges in flight
+    connector = aiohttp.TCPConnector(limit=max(connections, 1), ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector, timeout=REQUEST_TIMEOUT) as session:
+        probe = await _with_retries(lambda: _probe(session, url))
+        expected_sha256 = (sha256 or probe.sha256 or '').lower() or None
+        # Fetch from the redirect target directly so each range request skips the
+        # extra round trip (and TLS handshake) to the origin; resume state stays
+        # keyed on the original URL because CDN links are signed and expire
+        fetch_url = probe.final_url
+
+        if probe.accepts_ranges and probe.total_size > 0:
+            state = _ResumeState.load(state_path, url, probe.total_size, probe.validator) if part.exists() else None
+            if state is not None:
+                print(f"Resuming download at {state.downloaded * 100 // probe.total_size}%")
+            else:
+                parts = connections if probe.total_size >= MIN_SPLIT_SIZE else 1
+                state = _ResumeState(state_path, url, probe.total_size, probe.validator,
+                                     _split(probe.total_size, max(parts, 1)))
+                with open(part, 'wb') as f:
+                    _preallocate(f, probe.total_size)
+                state.save()
+
+            progress = _Progress(probe.total_size, state.downloaded)
+            try:
+                actual = await _download_ranges(session, fetch_url, part, state, progress, bool(expected_sha256))
+            except RangeNotSupported as e:
+                print(f"\nRange requests unavailable ({e}); using a single stream")
+                state_path.unlink(missing_ok=True)
+                progress = _Progress(probe.total_size)
+                actual = await _with_retries(lambda: _download_single(session, fetch_url, part, progress))
+        else:
+            progress = _Progress(probe.total_size)
+            actual = await _with_retries(lambda: _download_single(session, fetch_url, part, progress))
+    progress.finish()
+
+    # The digest was computed while downloading; no second read of the file
+    if expected_sha256:
+        if actual != expected_sha256:
+            part.unlink()
+            state_path.unlink(missing_ok=True)
+            raise IOError(f"SHA-256 mismatch for {filepath.name}: expected {expected_sha256}, got {actual}")
+
+    await asyncio.to_thread(_commit_part, part, filepath)
+    state_path.unlink(missing_ok=True)
+    write_fingerprint(filepath)
+
+
+def download_file(url: str, filepath: Path, connections: int = DEFAULT_CONNECTIONS,
+                  sha256: Optional[str] = None):
+    """Download url to filepath, using parallel range requests when possible.
+    Interrupted downloads resume from filepath.part on the next call. The file is
+    checked against sha256 (or the digest the server advertises) before it is
+    moved into place, and a fingerprint is left for verify_fingerprint().
+    Raises on failure; the caller decides how to report it.
+    """
+    asyncio.run(_download(url, filepath, connections, sha256))
@@ -1,21 +1,32 @@
 import os
-import json
+import re
 import socket
+import asyncio
+import copy
+import hashlib
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+import orjson
+import aiofiles
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Union
 from pathlib import Path
-import qrcode
-from io import BytesIO
-import base64
+import segno
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, StreamingResponse, HTMLResponse, RedirectResponse, FileResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse, HTMLResponse, RedirectResponse, FileResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 from zeroconf import ServiceInfo, Zeroconf
+try:
+    from dateutil.parser import parse as parse_date
+except ImportError:  # ISO dates still work without python-dateutil
+    parse_date = datetime.fromisoformat
 import threading
+import queue
+from concurrent.futures import Future
 import time
 
 # Data models
@@ -40,7 +51,7 @@ class SettingsConfig(BaseModel):
     accessibility: Dict[str, Any] = {}
 
 # Initialize FastAPI app
-app = FastAPI(title="NDK Tracker Backend", version="1.0.0")
+app = FastAPI(title="NDK Tracker Backend", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Initialize templates with PyInstaller-compatible path
 import sys
@@ -91,59 +102,266 @@ SESSIONS_DIR.mkdir(exist_ok=True)
 
 # In-memory session storage for ongoing conversations
 active_sessions: Dict[str, Dict] = {}
+# Last activity per active session, least recently used first, so the
+# sweeper only has to look at the sessions it actually expires
+_session_last_seen: "OrderedDict[str, float]" = OrderedDict()
+
+# Abandoned sessions are saved as "expired" after SESSION_TTL seconds idle
+SESSION_TTL = 60 * 60
+SESSION_SWEEP_INTERVAL = 5 * 60
+
+def _read_json(path: Path) -> Any:
+    """Read and decode a JSON file"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+async def _aread_json(path: Path) -> Any:
+    """Read and decode a JSON file without blocking the event loop"""
+    async with aiofiles.open(path, 'rb') as f:
+        return orjson.loads(await f.read())
+
+# Parsed settings/schedule files keyed by path, valid while (mtime, size) match
+_json_file_cache: Dict[Path, tuple] = {}
+
+async def _aread_json_cached(path: Path) -> Any:
+    """Read a rarely-changing JSON file, re-parsing only when it changes on disk"""
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _json_file_cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    value = await _aread_json(path)
+    _json_file_cache[path] = (stamp, value)
+    return value
+
+async def _awrite_json(path: Path, data: Any):
+    """Encode and write a JSON file without blocking the event loop"""
+    async with aiofiles.open(path, 'wb') as f:
+        await f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    # Refresh the read cache: on coarse-mtime filesystems a same-size rewrite
+    # would keep the old (mtime, size) stamp and the stale value
+    st = path.stat()
+    _json_file_cache[path] = ((st.st_mtime_ns, st.st_size), copy.deepcopy(data))
+
+_today_cache = {"second": -1, "date": ""}
+
+def _today_str() -> str:
+    """Local date as YYYY-MM-DD, formatted at most once per second"""
+    second = int(time.time())
+    if second != _today_cache["second"]:
+        _today_cache["date"] = datetime.now().strftime("%Y-%m-%d")
+        _today_cache["second"] = second
+    return _today_cache["date"]
 
 class DataManager:
     """Manages local JSON file storage"""
     
+    # Today's daily file is kept in memory so saves append instead of re-reading it.
+    # Disk writes are handed to a single writer thread, which coalesces bursts.
+    _daily_cache: Dict[str, Dict] = {}
+    _lock = threading.Lock()
+    _write_queue: "queue.Queue" = queue.Queue()
+    _writer: Optional[threading.Thread] = None
+    
     @staticmethod
     def save_session(session_data: Dict) -> str:
         """Save a complete session to daily JSON file"""
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        date_str = _today_str()
         file_path = SESSIONS_DIR / f"{date_str}.json"
         
-        # Load existing data or create new
-        if file_path.exists():
-            with open(file_path, 'r') as f:
-                daily_data = json.load(f)
-        else:
-            daily_data = {"date": date_str, "sessions": []}
-        
-        # Add new session
-        daily_data["sessions"].append(session_data)
-        
-        # Save back to file
-        with open(file_path, 'w') as f:
-            json.dump(daily_data, f, indent=2, default=str)
+        with DataManager._lock:
+            daily_data = DataManager._daily_cache.get(date_str)
+            if daily_data is None:
+                # Load existing data or create new; older days are no longer appended to
+                if file_path.exists():
+                    daily_data = _read_json(file_path)
+                else:
+                    daily_data = {"date": date_str, "sessions": []}
+                DataManager._daily_cache.clear()
+                DataManager._daily_cache[date_str] = daily_data
+            
+            # Add new session
+            daily_data["sessions"].append(session_data)
         
+        DataManager._schedule_write(file_path, daily_data)
         return str(file_path)
     
     @staticmethod
-    def get_daily_data(date: str) -> Dict:
+    def _schedule_write(file_path: Path, daily_data: Dict):
+        """Queue a daily file for the background writer"""
+        with DataManager._lock:
+            if DataManager._writer is None:
+                DataManager._writer = threading.Thread(
+                    target=DataManager._write_loop, name="session-writer", daemon=True
+                )
+                DataManager._writer.start()
+        DataManager._write_queue.put((file_path, daily_data))
+    
+    @staticmethod
+    def _write_loop():
+        """Write queued daily files, keeping only the latest snapshot per file"""
+        q = DataManager._write_queue
+        while True:
+            pending = dict([q.get()])
+            received = 1
+            while True:
+                try:
+                    file_path, daily_data = q.get_nowait()
+                except queue.Empty:
+                    break
+                pending[file_path] = daily_data
+                received += 1
+            try:
+                for file_path, daily_data in pending.items():
+                    with DataManager._lock:
+                        payload = orjson.dumps(daily_data, option=orjson.OPT_INDENT_2)
+                    with open(file_path, 'wb') as f:
+                        f.write(payload)
+            except Exception as e:
+                print(f"Failed to write session data: {e}")
+            finally:
+                for _ in range(received):
+                    q.task_done()
+    
+    @staticmethod
+    def flush():
+        """Block until all queued session writes are on disk"""
+        DataManager._write_queue.join()
+    
+    @staticmethod
+    async def get_daily_data(date: str) -> Dict:
         """Retrieve data for a specific date"""
+        with DataManager._lock:
+            cached = DataManager._daily_cache.get(date)
+        if cached is not None:
+            return cached
         file_path = SESSIONS_DIR / f"{date}.json"
         if file_path.exists():
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return await _aread_json(file_path)
         return {"date": date, "sessions": []}
     
     @staticmethod
-    def get_date_range_data(start_date: str, end_date: str) -> List[Dict]:
+    async def get_date_range_data(start_date: str, end_date: str) -> List[Dict]:
         """Get data for a date range"""
-        # Simple implementation - can be optimized
-        from dateutil.parser import parse
-        from dateutil.rrule import rrule, DAILY
-        
-        start = parse(start_date).date()
-        end = parse(end_date).date()
+        # Daily files are named YYYY-MM-DD, so a string compare selects the range
+        start = parse_date(start_date).date().isoformat()
+        end = parse_date(end_date).date().isoformat()
+        dates = {p.stem for p in SESSIONS_DIR.glob("*.json") if start <= p.stem <= end}
+        with DataManager._lock:
+            dates.update(d for d in DataManager._daily_cache if start <= d <= end)
         
-        data = []
-        for dt in rrule(DAILY, dtstart=start, until=end):
-            date_str = dt.strftime("%Y-%m-%d")
-            daily_data = DataManager.get_daily_data(date_str)
-            if daily_data["sessions"]:
-                data.append(daily_data)
-        
-        return data
+        results = await asyncio.gather(
+            *(DataManager.get_daily_data(d) for d in sorted(dates))
+        )
+        return [daily_data for daily_data in results if daily_data["sessions"]]
+
+# Static instructions for data extraction, up to and including the opening quote
+# of the user input. Kept byte-identical across calls so llama.cpp can reuse its
+# KV cache for it.
+EXTRACTION_PROMPT_PREFIX = """
+You are helping extract structured data from user input about daily activities for a neurodiverse child.
+
+Categories to extract:
+- food: what was eaten
+- medication: any meds taken  
+- behavior: mood, activities, incidents
+- exercise: physical activities
+- water: fluid intake
+- potty: bathroom activities
+- school: feedback, events, notes
+
+Please extract relevant information from the user input below and identify any missing details that need clarification.
+
+Respond in JSON format:
+{
+    "extracted_data": {
+        "food": [],
+        "medication": [],
+        "behavior": [],
+        "exercise": [],
+        "water": [],
+        "potty": [],
+        "school": []
+    },
+    "missing_info": [],
+    "clarification_question": "optional question if info is missing or unclear",
+    "confidence": 0.8
+}
+
+User input: \""""
+# Ends with an explicit answer cue so small models start the JSON instead of
+# echoing the input or continuing the conversation
+EXTRACTION_PROMPT_SUFFIX = '"\n\nRespond with the JSON object only.\nJSON:'
+
+# Keywords for the fallback extractor when no LLM is available
+FALLBACK_KEYWORDS = {
+    "food": ["ate", "food", "lunch", "dinner", "breakfast", "snack", "drink"],
+    "medication": ["medication", "medicine", "pill", "dose", "took"],
+    "behavior": ["happy", "sad", "angry", "calm", "meltdown", "behavior"],
+}
+_KEYWORD_RE = re.compile(
+    "|".join(
+        f"(?P<{category}>{'|'.join(map(re.escape, words))})"
+        for category, words in FALLBACK_KEYWORDS.items()
+    ),
+    re.IGNORECASE,
+)
+
+def _extract_json_object(text: str) -> Optional[Any]:
+    """Decode the first balanced {...} block in an LLM response.
+
+    A single linear scan tracks brace depth (ignoring braces inside strings),
+    so responses with several JSON blocks or trailing chatter still parse. A
+    block that fails to decode is skipped as a whole, never searched for a
+    nested object.
+    """
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = escaped = False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        return orjson.loads(text[start:i + 1])
+                    except orjson.JSONDecodeError:
+                        break
+        else:
+            # Unbalanced to the end of the text (e.g. truncated output)
+            return None
+        start = text.find("{", i + 1)
+    return None
+
+def _is_extraction_result(result: Any) -> bool:
+    """Whether a parsed LLM response has the shape _record_entry relies on"""
+    return isinstance(result, dict) and isinstance(result.get("extracted_data"), dict)
+
+# Sampling settings shared by buffered and streaming llama.cpp calls
+LLAMACPP_GENERATION = {
+    "max_tokens": 512,
+    "top_p": 0.9,
+    "echo": False,
+    "stop": ["</s>", "\n\n"],
+}
+
+# ollama client module, imported once by LLMProcessor._check_ollama
+_ollama = None
+
+# Response cache tuning for LLMProcessor
+RESPONSE_CACHE_SIZE = 1024
 
 class LLMProcessor:
     """Handles local LLM processing for conversation and data extraction"""
@@ -160,6 +378,17 @@ class LLMProcessor:
         self.ollama_available = False
         self.llamacpp_available = False
         self.llm_instance = None
+        # llama.cpp models are not thread-safe; all calls run on one worker thread
+        self._llamacpp_jobs: "queue.Queue" = queue.Queue()
+        self._llamacpp_worker: Optional[threading.Thread] = None
+        self._llamacpp_worker_lock = threading.Lock()
+        self._ollama_async_client = None
+        self.temperature = 0.7
+        
+        # Exact-match response cache (LRU); stored from the llama.cpp worker
+        # thread and read on the event loop, so guarded by a lock
+        self._exact_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._exact_cache_lock = threading.Lock()
         
         # Check available backends
         self._check_ollama()
@@ -182,8 +411,10 @@ class LLMProcessor:
     
     def _check_ollama(self):
         """Check if Ollama is available"""
+        global _ollama
         try:
             import ollama
+            _ollama = ollama
             # Test connection
             ollama.list()
             self.ollama_available = True
@@ -239,33 +470,139 @@ class LLMProcessor:
             self.llm_instance = Llama(
                 model_path=model_path,
                 n_ctx=2048,  # Context window
-                n_threads=None,  # Use all available threads
+                n_threads=self._physical_cores(),  # Fixed pool reused across calls
                 n_gpu_layers=0,  # Use GPU if available (set to -1 for full GPU)
                 verbose=False
             )
             print(f"llama.cpp initialized with model: {model_path}")
+            self._submit_llamacpp(self._warm_prompt_cache)
             
         except Exception as e:
             print(f"Failed to initialize llama.cpp: {e}")
             self.llamacpp_available = False
             self.llm_instance = None
     
+    @staticmethod
+    def _physical_cores() -> int:
+        """Physical core count; hyperthreads don't help llama.cpp matmuls"""
+        try:
+            import psutil
+            cores = psutil.cpu_count(logical=False)
+        except ImportError:
+            cores = None
+        return cores or os.cpu_count() or 4
+    
+    def _submit_llamacpp(self, fn, *args) -> Future:
+        """Queue a call for the llama.cpp worker thread"""
+        with self._llamacpp_worker_lock:
+            if self._llamacpp_worker is None:
+                self._llamacpp_worker = threading.Thread(
+                    target=self._llamacpp_worker_loop, name="llamacpp-worker", daemon=True
+                )
+                self._llamacpp_worker.start()
+        future: Future = Future()
+        self._llamacpp_jobs.put((future, fn, args))
+        return future
+    
+    def _llamacpp_worker_loop(self):
+        """Run queued llama.cpp calls one at a time, keeping the model hot"""
+        while True:
+            future, fn, args = self._llamacpp_jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def _warm_prompt_cache(self):
+        """Evaluate the static prompt prefix once so later calls only process the suffix"""
+        try:
+            # llama-cpp-python keeps the longest matching token prefix between calls
+            tokens = self.llm_instance.tokenize(EXTRACTION_PROMPT_PREFIX.encode())
+            self.llm_instance.reset()
+            self.llm_instance.eval(tokens)
+        except Exception as e:
+            print(f"Prompt cache warmup skipped: {e}")
+    
+    def _cache_key(self, user_input: str) -> str:
+        """Cache key for a user input under the current backend/model"""
+        raw = f"{self.llm_backend}:{self.model_name}:{user_input}".encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+    
+    def _cache_lookup(self, user_input: str) -> Optional[Dict]:
+        """Return a cached extraction result for this input, if any"""
+        key = self._cache_key(user_input)
+        with self._exact_cache_lock:
+            cached = self._exact_cache.get(key)
+            if cached is None:
+                return None
+            self._exact_cache.move_to_end(key)
+        return copy.deepcopy(cached)
+    
+    def _cache_store(self, user_input: str, result: Dict):
+        """Remember a successfully parsed LLM result"""
+        # A malformed result would be replayed for every identical input
+        if not _is_extraction_result(result):
+            return
+        key = self._cache_key(user_input)
+        result = copy.deepcopy(result)
+        with self._exact_cache_lock:
+            self._exact_cache[key] = result
+            self._exact_cache.move_to_end(key)
+            while len(self._exact_cache) > RESPONSE_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+    
     def process_input(self, user_input: str, context: Dict = None) -> Dict:
         """Process user input and extract structured data"""
+        if context is None:
+            cached = self._cache_lookup(user_input)
+            if cached is not None:
+                return cached
+        
         if self.llm_backend == "ollama" and self.ollama_available:
             return self._process_with_ollama(user_input, context)
         elif self.llm_backend == "llamacpp" and self.llamacpp_available:
-            return self._process_with_llamacpp(user_input, context)
+            return self._submit_llamacpp(self._process_with_llamacpp, user_input, context).result()
+        else:
+            return self._fallback_processing(user_input, context)
+    
+    async def aprocess_input(self, user_input: str, context: Dict = None) -> Dict:
+        """Async variant of process_input that keeps the event loop free during inference"""
+        if context is None:
+            cached = self._cache_lookup(user_input)
+            if cached is not None:
+                return cached
+        
+        if self.llm_backend == "ollama" and self.ollama_available:
+            return await self._aprocess_with_ollama(user_input, context)
+        elif self.llm_backend == "llamacpp" and self.llamacpp_available:
+            future = self._submit_llamacpp(self._process_with_llamacpp, user_input, context)
+            return await asyncio.wrap_future(future)
         else:
             return self._fallback_processing(user_input, context)
     
     def _process_with_ollama(self, user_input: str, context: Dict = None) -> Dict:
         """Process input using Ollama"""
         try:
-            import ollama
+            prompt = self._build_extraction_prompt(user_input, context)
+            response = _ollama.generate(model=self.model_name, prompt=prompt)
+            
+            # Parse the LLM response
+            return self._parse_llm_response(response['response'], user_input)
+            
+        except Exception as e:
+            print(f"Ollama processing error: {e}")
+            return self._fallback_processing(user_input, context)
+    
+    async def _aprocess_with_ollama(self, user_input: str, context: Dict = None) -> Dict:
+        """Process input using Ollama's async client"""
+        try:
+            if self._ollama_async_client is None:
+                self._ollama_async_client = _ollama.AsyncClient()
             
             prompt = self._build_extraction_prompt(user_input, context)
-            response = ollama.generate(model=self.model_name, prompt=prompt)
+            response = await self._ollama_async_client.generate(model=self.model_name, prompt=prompt)
             
             # Parse the LLM response
             return self._parse_llm_response(response['response'], user_input)
@@ -283,14 +620,7 @@ class LLMProcessor:
             prompt = self._build_extraction_prompt(user_input, context)
             
             # Generate response using llama.cpp
-            response = self.llm_instance(
-                prompt,
-                max_tokens=512,
-                temperature=0.7,
-                top_p=0.9,
-                echo=False,
-                stop=["</s>", "\n\n"]
-            )
+            response = self.llm_instance(prompt, temperature=self.temperature, **LLAMACPP_GENERATION)
             
             response_text = response['choices'][0]['text'].strip()
             
@@ -301,54 +631,78 @@ class LLMProcessor:
             print(f"llama.cpp processing error: {e}")
             return self._fallback_processing(user_input, context)
     
+    async def astream_input(self, user_input: str) -> AsyncIterator[Union[str, Dict]]:
+        """Stream LLM output as text deltas, then yield the parsed result dict last"""
+        cached = self._cache_lookup(user_input)
+        if cached is not None:
+            yield cached
+        elif self.llm_backend == "ollama" and self.ollama_available:
+            try:
+                if self._ollama_async_client is None:
+                    self._ollama_async_client = _ollama.AsyncClient()
+                
+                prompt = self._build_extraction_prompt(user_input)
+                parts = []
+                stream = await self._ollama_async_client.generate(model=self.model_name, prompt=prompt, stream=True)
+                async for chunk in stream:
+                    parts.append(chunk['response'])
+                    yield chunk['response']
+                processed = self._parse_llm_response("".join(parts), user_input)
+            except Exception as e:
+                print(f"Ollama processing error: {e}")
+                processed = self._fallback_processing(user_input)
+            yield processed
+        elif self.llm_backend == "llamacpp" and self.llamacpp_available:
+            loop = asyncio.get_running_loop()
+            deltas: asyncio.Queue = asyncio.Queue()
+            cancelled = threading.Event()
+            future = self._submit_llamacpp(self._stream_with_llamacpp, user_input, loop, deltas, cancelled)
+            try:
+                while (delta := await deltas.get()) is not None:
+                    yield delta
+                processed = self._parse_llm_response(await asyncio.wrap_future(future), user_input)
+            except Exception as e:
+                print(f"llama.cpp processing error: {e}")
+                processed = self._fallback_processing(user_input)
+            finally:
+                # Stop generating if the client went away mid-stream
+                cancelled.set()
+            yield processed
+        else:
+            yield self._fallback_processing(user_input)
+    
+    def _stream_with_llamacpp(self, user_input: str, loop: asyncio.AbstractEventLoop,
+                              deltas: asyncio.Queue, cancelled: threading.Event) -> str:
+        """Generate on the llama.cpp worker, forwarding tokens to the event loop"""
+        try:
+            if not self.llm_instance:
+                raise Exception("llama.cpp model not initialized")
+            
+            prompt = self._build_extraction_prompt(user_input)
+            parts = []
+            for chunk in self.llm_instance(prompt, temperature=self.temperature, stream=True, **LLAMACPP_GENERATION):
+                text = chunk['choices'][0]['text']
+                parts.append(text)
+                loop.call_soon_threadsafe(deltas.put_nowait, text)
+                if cancelled.is_set():
+                    break
+            return "".join(parts).strip()
+        finally:
+            loop.call_soon_threadsafe(deltas.put_nowait, None)
+    
     def _build_extraction_prompt(self, user_input: str, context: Dict = None) -> str:
         """Build prompt for data extraction"""
-        prompt = f"""
-You are helping extract structured data from user input about daily activities for a neurodiverse child.
-
-Categories to extract:
-- food: what was eaten
-- medication: any meds taken  
-- behavior: mood, activities, incidents
-- exercise: physical activities
-- water: fluid intake
-- potty: bathroom activities
-- school: feedback, events, notes
-
-User input: "{user_input}"
-
-Please extract relevant information and identify any missing details that need clarification.
-
-Respond in JSON format:
-{{
-    "extracted_data": {{
-        "food": [],
-        "medication": [],
-        "behavior": [],
-        "exercise": [],
-        "water": [],
-        "potty": [],
-        "school": []
-    }},
-    "missing_info": [],
-    "clarification_question": "optional question if info is missing or unclear",
-    "confidence": 0.8
-}}
-"""
-        return prompt
+        # Plain concatenation of constants: only the user input varies
+        return EXTRACTION_PROMPT_PREFIX + user_input + EXTRACTION_PROMPT_SUFFIX
     
     def _parse_llm_response(self, response: str, original_input: str) -> Dict:
         """Parse LLM JSON response"""
-        try:
-            # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-        except:
-            pass
+        result = _extract_json_object(response)
+        if _is_extraction_result(result):
+            self._cache_store(original_input, result)
+            return result
         
-        # Fallback if JSON parsing fails
+        # Fallback if JSON parsing fails or the object isn't an extraction result
         return self._fallback_processing(original_input)
     
     def _fallback_processing(self, user_input: str, context: Dict = None) -> Dict:
@@ -363,23 +717,11 @@ Respond in JSON format:
             "school": []
         }
         
-        # Simple keyword matching
-        input_lower = user_input.lower()
-        
-        # Food keywords
-        food_words = ["ate", "food", "lunch", "dinner", "breakfast", "snack", "drink"]
-        if any(word in input_lower for word in food_words):
-            extracted_data["food"].append(user_input)
-        
-        # Medication keywords
-        med_words = ["medication", "medicine", "pill", "dose", "took"]
-        if any(word in input_lower for word in med_words):
-            extracted_data["medication"].append(user_input)
-        
-        # Behavior keywords
-        behavior_words = ["happy", "sad", "angry", "calm", "meltdown", "behavior"]
-        if any(word in input_lower for word in behavior_words):
-            extracted_data["behavior"].append(user_input)
+        # Simple keyword matching, one regex pass for all categories
+        for match in _KEYWORD_RE.finditer(user_input):
+            category = match.lastgroup
+            if not extracted_data[category]:
+                extracted_data[category].append(user_input)
         
         return {
             "extracted_data": extracted_data,
@@ -426,37 +768,77 @@ Respond in JSON format:
 # Initialize LLM processor with default settings
 llm_processor = LLMProcessor()
 
+# The LAN IP rarely changes; re-resolve it at most every LOCAL_IP_TTL seconds
+LOCAL_IP_TTL = 30
+_ip_cache = {"ip": None, "ts": 0.0}
+
 def get_local_ip():
     """Get the local IP address"""
+    now = time.monotonic()
+    if _ip_cache["ip"] and now - _ip_cache["ts"] < LOCAL_IP_TTL:
+        return _ip_cache["ip"]
     try:
         # Connect to a remote address to get local IP
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.connect(("8.8.8.8", 80))
         local_ip = s.getsockname()[0]
         s.close()
-        return local_ip
     except:
         return "127.0.0.1"
+    _ip_cache["ip"] = local_ip
+    _ip_cache["ts"] = now
+    return local_ip
 
+@lru_cache(maxsize=8)
 def generate_qr_code(data: str) -> str:
-    """Generate QR code as base64 image"""
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
+    """Generate QR code as an SVG data URI (no raster encoding needed)"""
+    qr = segno.make(data, error="l", micro=False)
+    return qr.svg_data_uri(scale=10, border=4, dark="black", light="white")
+
+def _lan_pairing_url(local_ip: str) -> str:
+    """URL the pairing QR code points phones at (HTTPS on the LAN address)"""
+    return f"https://{local_ip}:8443/pair"
+
+def _report_task_failure(task: asyncio.Task):
+    """Background tasks have no caller awaiting them, so print their errors here"""
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Background task {task.get_name()} failed: {task.exception()!r}")
+
+def _start_background_task(name: str, coro) -> asyncio.Task:
+    """Start a task and keep a strong reference to it on app.state (the loop only holds it weakly)"""
+    task = asyncio.create_task(coro, name=name)
+    task.add_done_callback(_report_task_failure)
+    setattr(app.state, name, task)
+    return task
+
+# Started by the startup hooks below; cancelled on shutdown
+BACKGROUND_TASKS = ("qr_prewarm", "session_sweeper")
+app.state.qr_prewarm = None
+app.state.session_sweeper = None
+
+@app.on_event("startup")
+async def prewarm_pairing_qr():
+    """Render the pairing QR code off the event loop so the first /pairing/info is a cache hit"""
+    _start_background_task(
+        "qr_prewarm",
+        asyncio.to_thread(lambda: generate_qr_code(_lan_pairing_url(get_local_ip()))),
     )
-    qr.add_data(data)
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Convert to base64
-    buffered = BytesIO()
-    img.save(buffered, format="PNG")
-    img_str = base64.b64encode(buffered.getvalue()).decode()
-    
-    return f"data:image/png;base64,{img_str}"
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    """Cancel background tasks and wait for them before session writes are flushed"""
+    tasks = [getattr(app.state, name) for name in BACKGROUND_TASKS]
+    tasks = [task for task in tasks if task is not None]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for name in BACKGROUND_TASKS:
+        setattr(app.state, name, None)
+
+@app.on_event("shutdown")
+async def flush_session_writes():
+    """Make sure queued session writes reach disk before exiting"""
+    await asyncio.to_thread(DataManager.flush)
 
 # API Endpoints
 
@@ -529,7 +911,7 @@ async def get_pairing_info(request: Request):
     https_port = 8443
     lan_https = f"https://{local_ip}:{https_port}"
     lan_http = f"http://{local_ip}:{port}"
-    pairing_url = f"{lan_https}/pair"
+    pairing_url = _lan_pairing_url(local_ip)
     
     return {
         "endpoint": host_base,
@@ -547,44 +929,45 @@ async def get_pairing_info(request: Request):
         ]
     }
 
-@app.post("/input/log")
-async def log_entry(entry: LogEntry):
-    """Process and log a new entry"""
-    session_id = entry.session_id or f"session_{int(time.time())}"
-    
-    # Process input with LLM
-    processed = llm_processor.process_input(entry.message)
+def _new_session_id() -> str:
+    return f"session_{int(time.time())}"
+
+def _record_entry(entry: LogEntry, session_id: str, processed: Dict) -> Dict:
+    """Add a processed entry to its active session and build the API response"""
+    now = datetime.now(timezone.utc).isoformat()
     
     # Create or update session
     if session_id not in active_sessions:
         active_sessions[session_id] = {
             "session_id": session_id,
-            "start_time": datetime.now(timezone.utc).isoformat(),
+            "start_time": now,
             "conversation": [],
-            "raw_text_aggregate": "",
-            "structured_data": {},
+            # Joined into raw_text_aggregate on save to avoid quadratic string concat
+            "raw_text_chunks": [],
+            "structured_data": defaultdict(list),
             "status": "in_progress"
         }
     
     session = active_sessions[session_id]
+    _session_last_seen[session_id] = time.monotonic()
+    _session_last_seen.move_to_end(session_id)
     
     # Add to conversation history
     session["conversation"].append({
         "from": "user",
         "message": entry.message,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now,
         "voice_input": entry.voice_input
     })
     
     # Update aggregated text
-    session["raw_text_aggregate"] += f" {entry.message}"
+    session["raw_text_chunks"].append(entry.message)
     
     # Update structured data
+    structured_data = session["structured_data"]
     for category, data in processed["extracted_data"].items():
         if data:
-            if category not in session["structured_data"]:
-                session["structured_data"][category] = []
-            session["structured_data"][category].extend(data)
+            structured_data[category].extend(data)
     
     # Check if clarification needed
     response_data = {
@@ -598,7 +981,7 @@ async def log_entry(entry: LogEntry):
         session["conversation"].append({
             "from": "app",
             "message": processed["clarification_question"],
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now
         })
         
         response_data["clarification_needed"] = True
@@ -610,6 +993,36 @@ async def log_entry(entry: LogEntry):
     
     return response_data
 
+@app.post("/input/log")
+async def log_entry(entry: LogEntry):
+    """Process and log a new entry"""
+    session_id = entry.session_id or _new_session_id()
+    
+    # Process input with LLM without blocking the event loop
+    processed = await llm_processor.aprocess_input(entry.message)
+    
+    return _record_entry(entry, session_id, processed)
+
+@app.post("/input/log/stream")
+async def log_entry_stream(entry: LogEntry):
+    """Process and log a new entry, streaming LLM output as newline-delimited JSON.
+
+    Each line is {"delta": "..."} while the model generates; the final line is
+    the same response body /input/log returns.
+    """
+    session_id = entry.session_id or _new_session_id()
+    
+    async def events():
+        processed = None
+        async for item in llm_processor.astream_input(entry.message):
+            if isinstance(item, dict):
+                processed = item
+            else:
+                yield orjson.dumps({"delta": item}) + b"\n"
+        yield orjson.dumps(_record_entry(entry, session_id, processed)) + b"\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 @app.post("/input/clarify")
 async def clarify_entry(clarification: ClarificationResponse):
     """Handle clarification response"""
@@ -626,21 +1039,29 @@ async def clarify_entry(clarification: ClarificationResponse):
     
     return await log_entry(entry)
 
+def _finalize_session(session: Dict, status: str) -> Dict:
+    """Stored form of an active session; the active session itself is left as is
+    so it can stay in active_sessions if saving fails"""
+    stored = {key: value for key, value in session.items() if key != "raw_text_chunks"}
+    stored["status"] = status
+    stored["end_time"] = datetime.now(timezone.utc).isoformat()
+    stored["raw_text_aggregate"] = " ".join(session["raw_text_chunks"])
+    stored["structured_data"] = dict(session["structured_data"])
+    return stored
+
 @app.post("/input/save_session")
 async def save_session(session_data: Dict):
     """Save a completed session"""
     session_id = session_data.get("session_id")
     
     if session_id and session_id in active_sessions:
-        session = active_sessions[session_id]
-        session["status"] = "completed"
-        session["end_time"] = datetime.now(timezone.utc).isoformat()
-        
-        # Save to file
-        file_path = DataManager.save_session(session)
+        stored = _finalize_session(active_sessions[session_id], "completed")
         
-        # Remove from active sessions
-        del active_sessions[session_id]
+        # Save to file; the session stays active until that succeeds, so a
+        # failed save can be retried
+        file_path = await asyncio.to_thread(DataManager.save_session, stored)
+        active_sessions.pop(session_id, None)
+        _session_last_seen.pop(session_id, None)
         
         return {
             "success": True,
@@ -650,17 +1071,54 @@ async def save_session(session_data: Dict):
     
     raise HTTPException(status_code=400, detail="Invalid session")
 
+async def _sweep_stale_sessions():
+    """Periodically save and drop sessions that have gone idle"""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+        cutoff = time.monotonic() - SESSION_TTL
+        while _session_last_seen:
+            session_id, last_seen = next(iter(_session_last_seen.items()))
+            if last_seen > cutoff:
+                break
+            session = active_sessions.get(session_id)
+            if session and session["conversation"]:
+                try:
+                    await asyncio.to_thread(DataManager.save_session, _finalize_session(session, "expired"))
+                except Exception as e:
+                    # Keep the session and try again after another TTL
+                    print(f"Failed to save expired session {session_id}: {e}")
+                    _session_last_seen[session_id] = time.monotonic()
+                    _session_last_seen.move_to_end(session_id)
+                    continue
+            _session_last_seen.pop(session_id, None)
+            active_sessions.pop(session_id, None)
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    """Start the idle-session sweeper unless one is already running"""
+    if app.state.session_sweeper is None:
+        _start_background_task("session_sweeper", _sweep_stale_sessions())
+
 @app.get("/data/summary")
 async def get_data_summary(date: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get daily or date range summary"""
     if date:
-        return DataManager.get_daily_data(date)
+        return await DataManager.get_daily_data(date)
     elif start_date and end_date:
-        return DataManager.get_date_range_data(start_date, end_date)
+        return await DataManager.get_date_range_data(start_date, end_date)
     else:
         # Default to today
-        today = datetime.now().strftime("%Y-%m-%d")
-        return DataManager.get_daily_data(today)
+        return await DataManager.get_daily_data(_today_str())
+
+TIMELINE_GROUPS = [
+    {"id": "food", "content": "Food"},
+    {"id": "medication", "content": "Medication"},
+    {"id": "behavior", "content": "Behavior"},
+    {"id": "exercise", "content": "Exercise"},
+    {"id": "water", "content": "Water"},
+    {"id": "potty", "content": "Potty"},
+    {"id": "school", "content": "School"}
+]
 
 @app.get("/timeline/view")
 async def get_timeline_data(start_date: Optional[str] = None, end_date: Optional[str] = None):
@@ -668,45 +1126,40 @@ async def get_timeline_data(start_date: Optional[str] = None, end_date: Optional
     if not start_date:
         start_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
     if not end_date:
-        end_date = datetime.now().strftime("%Y-%m-%d")
+        end_date = _today_str()
     
-    data = DataManager.get_date_range_data(start_date, end_date)
+    data = await DataManager.get_date_range_data(start_date, end_date)
     
     # Transform for timeline visualization
     timeline_items = []
+    counter = 0
     
     for daily_data in data:
         for session in daily_data["sessions"]:
+            session_id = session["session_id"]
+            start = session.get("start_time", daily_data["date"])
             for category, items in session.get("structured_data", {}).items():
                 for item in items:
                     timeline_items.append({
-                        "id": f"{session['session_id']}_{category}_{len(timeline_items)}",
+                        "id": f"{session_id}_{category}_{counter}",
                         "content": str(item),
-                        "start": session.get("start_time", daily_data["date"]),
+                        "start": start,
                         "group": category,
                         "category": category,
-                        "session_id": session["session_id"]
+                        "session_id": session_id
                     })
+                    counter += 1
     
     return {
         "items": timeline_items,
-        "groups": [
-            {"id": "food", "content": "Food"},
-            {"id": "medication", "content": "Medication"},
-            {"id": "behavior", "content": "Behavior"},
-            {"id": "exercise", "content": "Exercise"},
-            {"id": "water", "content": "Water"},
-            {"id": "potty", "content": "Potty"},
-            {"id": "school", "content": "School"}
-        ]
+        "groups": TIMELINE_GROUPS
     }
 
 @app.get("/settings")
 async def get_settings():
     """Get current settings"""
     if SETTINGS_FILE.exists():
-        with open(SETTINGS_FILE, 'r') as f:
-            return json.load(f)
+        return await _aread_json_cached(SETTINGS_FILE)
     
     # Return defaults
     return {
@@ -725,8 +1178,7 @@ async def update_settings(settings: SettingsConfig):
     """Update settings"""
     settings_dict = settings.dict()
     
-    with open(SETTINGS_FILE, 'w') as f:
-        json.dump(settings_dict, f, indent=2)
+    await _awrite_json(SETTINGS_FILE, settings_dict)
     
     # Update LLM configuration if changed
     if (settings.llm_model != llm_processor.model_name or 
@@ -739,8 +1191,7 @@ async def update_settings(settings: SettingsConfig):
 async def get_schedule():
     """Get current schedule configuration"""
     if SCHEDULE_FILE.exists():
-        with open(SCHEDULE_FILE, 'r') as f:
-            return json.load(f)
+        return await _aread_json_cached(SCHEDULE_FILE)
     
     # Return default schedule
     return {
@@ -758,8 +1209,7 @@ async def update_schedule(schedule: ScheduleConfig):
     """Update schedule configuration"""
     schedule_dict = schedule.dict()
     
-    with open(SCHEDULE_FILE, 'w') as f:
-        json.dump(schedule_dict, f, indent=2)
+    await _awrite_json(SCHEDULE_FILE, schedule_dict)
     
     return {"success": True, "schedule": schedule_dict}
 
@@ -777,13 +1227,24 @@ async def switch_llm_backend(backend: str, model_name: Optional[str] = None):
         "new_status": llm_processor.get_status()
     }
 
+# Installed Ollama models change rarely; reuse the daemon's answer briefly
+OLLAMA_MODELS_TTL = 60
+_ollama_models_cache = {"value": None, "ts": 0.0}
+
+async def _list_ollama_models() -> Dict:
+    """ollama.list(), cached for OLLAMA_MODELS_TTL seconds and run off the event loop"""
+    now = time.monotonic()
+    if _ollama_models_cache["value"] is None or now - _ollama_models_cache["ts"] >= OLLAMA_MODELS_TTL:
+        _ollama_models_cache["value"] = await asyncio.to_thread(_ollama.list)
+        _ollama_models_cache["ts"] = now
+    return _ollama_models_cache["value"]
+
 @app.get("/llm/models")
 async def get_available_models():
     """Get available models for current backend"""
     if llm_processor.llm_backend == "ollama" and llm_processor.ollama_available:
         try:
-            import ollama
-            models = ollama.list()
+            models = await _list_ollama_models()
             return {
                 "backend": "ollama",
                 "models": [model["name"] for model in models.get("models", [])]
@@ -823,6 +1284,7 @@ if __name__ == "__main__":
     parser.add_argument('--host', default='0.0.0.0', help='Host to bind to')
     parser.add_argument('--port', type=int, default=8080, help='Port to bind to')
     parser.add_argument('--reload', action='store_true', help='Enable auto-reload for development')
+    parser.add_argument('--access-log', action='store_true', help='Log every request (off by default)')
     
     args = parser.parse_args()
     
@@ -830,9 +1292,12 @@ if __name__ == "__main__":
     print(f"Local IP: {get_local_ip()}")
     print(f"LLM Available: {llm_processor.ollama_available}")
     
+    # Single worker on purpose: active_sessions and the loaded model live in-process.
+    # uvicorn's defaults pick uvloop and httptools (see requirements.txt) when installed.
     uvicorn.run(
         "main:app",
         host=args.host,
         port=args.port,
-        reload=args.reload
+        reload=args.reload,
+        access_log=args.access_log
     )
\ No newline at end of file
@@ -1,48 +1,33 @@
 #!/usr/bin/env python3
 """
 Minimal setup script for NDK Tracker
-Combines model download and backend startup in        logging.info(\"Backend imported successfully!\")
-        
-        # Test model initialization before starting server
-        try:
-            logging.info(\"Testing model initialization...\")
-            # This will trigger the backend to initialize the LLM
-            response = app.state if hasattr(app, 'state') else None
-            logging.info(\"Model initialization test completed\")
-        except Exception as e:
-            logging.warning(f\"Model initialization test failed: {e}\")
-            # Continue anyway, might work when server starts
-        
-        print(\"Backend started successfully!\")
-        print(\"Access the API at: http://localhost:8000\")
-        print(\"Press Ctrl+C to stop\")
-        print(f\"Logs are saved to: {log_file}\")
-        
-        # Add a small delay to let everything initialize
-        time.sleep(2)
-
-        uvicorn.run(app, host=\"0.0.0.0\", port=8000)ecutable
+Combines model download and backend startup in a single executable
 """
 
 import os
 import sys
-import subprocess
 import argparse
+import asyncio
+import functools
+import importlib
 from pathlib import Path
 from typing import Optional
-import requests
-import time
 import logging
-import traceback
-import ipaddress
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
 import socket
-from concurrent.futures import ThreadPoolExecutor
+import signal
+import mmap
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from downloader import download_file, remote_size, verify_fingerprint, write_fingerprint
 
-from cryptography import x509
-from cryptography.x509.oid import NameOID
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-from datetime import datetime, timedelta
+APP_NAME = "NDK Tracker"
+
+# Resolved by get_local_ip(); the address doesn't change during a run
+_LAN_IP_CACHE: Optional[str] = None
 
 # Minimal model - smaller GGUF for easier distribution
 MINIMAL_MODEL = {
@@ -50,12 +35,25 @@ MINIMAL_MODEL = {
     "filename": "tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf"
 }
 
+@functools.lru_cache(maxsize=8)
 def find_existing_model(models_dir: Path) -> Optional[Path]:
     """Search for an existing GGUF model in common locations.
     Preference: models next to the executable (for packaged app), then provided models_dir,
     then CWD/models, then any .gguf in CWD. Avoid backend script directory when frozen to
     prevent scattering models in source folders.
+    Results are cached per models_dir; call find_existing_model.cache_clear()
+    after adding a model.
     """
+    # An explicit model path needs no directory search at all
+    pre_set = os.environ.get('LLAMA_CPP_MODEL_PATH')
+    try:
+        pre_set_found = bool(pre_set) and Path(pre_set).is_file()
+    except OSError:
+        pre_set_found = False
+    if pre_set_found:
+        logging.info(f"Using model from LLAMA_CPP_MODEL_PATH: {pre_set}")
+        return Path(pre_set)
+
     candidates: list[Path] = []
     try:
         # Executable directory (PyInstaller onefile) / models has highest priority when frozen
@@ -78,263 +76,400 @@ def find_existing_model(models_dir: Path) -> Optional[Path]:
     for p in candidates:
         logging.info(f" - {p}")
 
-    # First, try exact filename in any candidate dir
+    candidates = list(dict.fromkeys(candidates))
+
+    # The exact filename is a literal, so probe it directly instead of listing directories
     for base in candidates:
+        target = base / MINIMAL_MODEL["filename"]
         try:
-            if base and base.exists():
-                target = base / MINIMAL_MODEL["filename"]
-                if target.exists():
-                    logging.info(f"Found existing model: {target}")
-                    return target
-        except Exception:
+            found = target.is_file()
+        except OSError:
+            # e.g. an unreadable directory; try the next candidate
             continue
+        if found:
+            logging.info(f"Found existing model: {target}")
+            return target
 
-    # Fallback: any .gguf in candidates (first one)
+    # Fallback: first .gguf in the earliest candidate, one scandir per directory
     for base in candidates:
         try:
-            if base and base.exists():
-                matches = list(base.glob('*.gguf'))
-                if matches:
-                    logging.info(f"Found alternative model: {matches[0]}")
-                    return matches[0]
-        except Exception:
+            with os.scandir(base) as entries:
+                match = next((e.path for e in entries if e.name.endswith('.gguf') and e.is_file()), None)
+        except OSError:
             continue
+        if match:
+            logging.info(f"Found alternative model: {match}")
+            return Path(match)
 
     logging.info("No existing model found in candidate paths.")
     return None
 
+def check_existing_model(model_path: Path) -> bool:
+    """False when the model on disk is known to be incomplete or damaged.
+    Models downloaded before fingerprints existed have none; the default model is
+    then compared with the size the server reports, and fingerprinted if it matches.
+    """
+    verdict = verify_fingerprint(model_path)
+    if verdict is not None:
+        return verdict
+    if model_path.name != MINIMAL_MODEL["filename"]:
+        # A model added by hand; nothing to compare it with
+        return True
+
+    expected = remote_size(MINIMAL_MODEL["url"])
+    if expected is None:
+        logging.info(f"Could not check the size of {model_path} (offline?); using it as is")
+        return True
+    if model_path.stat().st_size != expected:
+        return False
+    try:
+        write_fingerprint(model_path)
+    except OSError as e:
+        logging.info(f"Could not record a fingerprint for {model_path}: {e}")
+    return True
+
 def download_minimal_model(models_dir: Path):
     """Download minimal model for testing"""
     models_dir.mkdir(exist_ok=True)
     filepath = models_dir / MINIMAL_MODEL["filename"]
 
     if filepath.exists():
-        print(f"Model already exists: {filepath}")
-        return True
+        if not check_existing_model(filepath):
+            print(f"Existing model failed its integrity check, downloading it again: {filepath}")
+            filepath.unlink()
+        else:
+            print(f"Model already exists: {filepath}")
+            return True
 
     print("Downloading minimal model (this may take a few minutes)...")
 
     try:
-        response = requests.get(MINIMAL_MODEL["url"], stream=True)
-        response.raise_for_status()
-
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        print(f"\rProgress: {progress:.1f}%", end='', flush=True)
-
-        print(f"\nDownloaded {MINIMAL_MODEL['filename']} successfully")
+        download_file(MINIMAL_MODEL["url"], filepath)
+        # A cached "no model" answer is stale now
+        find_existing_model.cache_clear()
+        print(f"Downloaded {MINIMAL_MODEL['filename']} successfully")
         return True
 
     except Exception as e:
         print(f"Error downloading model: {e}")
         return False
 
+def prewarm_model(model_path: Path):
+    """Pull the model file into the page cache so llama.cpp's first mmap doesn't stall on disk"""
+    try:
+        with open(model_path, 'rb') as f:
+            if hasattr(os, 'posix_fadvise'):
+                # Linux: kernel-side readahead of the whole file; returns immediately
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            elif hasattr(mmap, 'MADV_WILLNEED'):
+                # macOS has no fadvise, but the same hint works on a mapping
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    mm.madvise(mmap.MADV_WILLNEED)
+            else:
+                # Windows/macOS without madvise: read it through once
+                while f.read(1024 * 1024):
+                    pass
+        logging.info(f"Prewarmed model file: {model_path}")
+    except Exception as e:
+        logging.info(f"Model prewarm skipped: {e}")
+
 def setup_logging(models_dir: Path):
-    """Setup logging to capture errors"""
+    """Setup logging to capture errors.
+    Records are queued and written by a background listener, so request
+    threads never block on file or console I/O.
+    """
     log_file = models_dir / "NDK_tracker.log"
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler(log_file, delay=True),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Drain anything still queued when the process exits
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
     return log_file
 
-def check_ollama_available():
-    """Check if Ollama is running"""
+def generate_tls_key():
+    """ECDSA P-256 key for the self-signed HTTPS certificate.
+    Much cheaper than RSA-2048 to generate and to sign with on every handshake,
+    and, unlike Ed25519, accepted for TLS by all major browsers.
+    """
+    from cryptography.hazmat.primitives.asymmetric import ec
+    return ec.generate_private_key(ec.SECP256R1())
+
+def _route_ip() -> Optional[str]:
+    """Address of the interface the routing table uses for outside traffic (a UDP connect sends no packets)"""
     try:
-        import ollama
-        ollama.list()
-        return True
-    except Exception as e:
-        logging.info(f"Ollama not available: {e}")
-        return False
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        return None
+
+def _hostname_ips() -> list[str]:
+    """Non-loopback IPv4 addresses the hostname resolves to"""
+    try:
+        infos = socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET)
+    except OSError:
+        return []
+    return list(dict.fromkeys(info[4][0] for info in infos if not info[4][0].startswith('127.')))
+
+def get_local_ip() -> str:
+    """LAN address of this machine.
+    Route-based first, like get_local_ip in main.py, so the certificate covers the
+    address the pairing QR code hands to phones; the hostname lookup is only used offline.
+    """
+    global _LAN_IP_CACHE
+    if _LAN_IP_CACHE is not None:
+        return _LAN_IP_CACHE
+
+    ip = _route_ip() or next(iter(_hostname_ips()), None)
+    if ip is None:
+        return "127.0.0.1"
+    _LAN_IP_CACHE = ip
+    return ip
+
+def ensure_self_signed_cert(cert_file: Path, key_file: Path, pending_key: Optional[Future] = None):
+    """Create the self-signed HTTPS certificate unless one already exists.
+    pending_key is a key being generated in the background (see start_backend).
+    """
+    try:
+        if cert_file.exists() and key_file.exists():
+            return
+        logging.info("Generating self-signed certificate for HTTPS...")
+        # Only needed on first run, so keep it off the startup path otherwise
+        from cryptography import x509
+        from cryptography.x509.oid import NameOID
+        from cryptography.hazmat.primitives import hashes, serialization
+        import ipaddress
+        from datetime import datetime, timedelta, timezone
+        key = pending_key.result() if pending_key is not None else generate_tls_key()
+        subject = issuer = x509.Name([
+            x509.NameAttribute(NameOID.COUNTRY_NAME, u"US"),
+            x509.NameAttribute(NameOID.ORGANIZATION_NAME, APP_NAME),
+            x509.NameAttribute(NameOID.COMMON_NAME, u"NDK Local"),
+        ])
+        alt_names = [
+            x509.DNSName(u"localhost"),
+        ]
+        # Add the LAN address as IP SAN, plus the hostname's addresses in case a
+        # multi-homed host (VPN, Docker) is reached on one of those instead
+        for local_ip in dict.fromkeys([get_local_ip(), *_hostname_ips()]):
+            try:
+                alt_names.append(x509.IPAddress(ipaddress.ip_address(local_ip)))
+            except Exception:
+                pass
+        san = x509.SubjectAlternativeName(alt_names)
+        now = datetime.now(timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(subject)
+            .issuer_name(issuer)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - timedelta(minutes=1))
+            .not_valid_after(now + timedelta(days=3650))
+            .add_extension(san, critical=False)
+            .sign(key, hashes.SHA256())
+        )
+        # PEM, not DER: uvicorn hands these paths to ssl.load_cert_chain
+        key_pem = key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        del key
+        key_file.write_bytes(key_pem)
+        cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+        logging.info(f"Self-signed cert generated at {cert_file.parent}")
+    except Exception:
+        import traceback
+        logging.error("Failed to create self-signed cert:")
+        logging.error(traceback.format_exc())
+
+def pause_on_error():
+    """Keep a double-clicked console window open so the error can be read.
+    Under a supervisor or in CI there is no terminal, so return straight away
+    and let the non-zero exit code report the failure.
+    """
+    if sys.stdin and sys.stdin.isatty():
+        input("Press Enter to continue...")
 
-def start_backend(models_dir: Path):
-    """Start the backend server"""
-    print("Starting NDK Tracker backend...")
+def start_backend(models_dir: Path, existing_model: Optional[Path] = None, https_only: bool = False):
+    """Start the backend server.
+    existing_model is the model main() already found, if any, so it isn't searched for again.
+    https_only skips the plain-HTTP listener on port 8000.
+    """
+    print(f"Starting {APP_NAME} backend...")
     
     # Setup logging
     log_file = setup_logging(models_dir)
     logging.info(f"Log file: {log_file}")
 
-    # Determine model path to use
-    env = os.environ.copy()
-    pre_set = env.get('LLAMA_CPP_MODEL_PATH')
+    # HTTPS certificate location; on first run start generating its key right away
+    # so it overlaps with model resolution and the backend import
+    certs_dir = models_dir / "certs"
+    certs_dir.mkdir(parents=True, exist_ok=True)
+    cert_file = certs_dir / "ndk_selfsigned.crt"
+    key_file = certs_dir / "ndk_selfsigned.key"
+    startup_pool = ThreadPoolExecutor(max_workers=2)
+    pending_key = None
+    if not (cert_file.exists() and key_file.exists()):
+        pending_key = startup_pool.submit(generate_tls_key)
+
+    # Determine model path to use; the backend reads it from this process's environment
+    pre_set = os.environ.get('LLAMA_CPP_MODEL_PATH')
     if pre_set and Path(pre_set).exists():
         model_path = Path(pre_set)
         logging.info(f"Using pre-set LLAMA_CPP_MODEL_PATH: {model_path}")
     else:
-        existing = find_existing_model(models_dir)
+        existing = existing_model or find_existing_model(models_dir)
         if existing and existing.exists():
             model_path = existing
         else:
             model_path = models_dir / MINIMAL_MODEL["filename"]
-        env['LLAMA_CPP_MODEL_PATH'] = str(model_path)
-    logging.info(f"Final model path: {env.get('LLAMA_CPP_MODEL_PATH')}")
+        os.environ['LLAMA_CPP_MODEL_PATH'] = str(model_path)
+    logging.info(f"Final model path: {os.environ['LLAMA_CPP_MODEL_PATH']}")
+    if model_path.is_file():
+        # Overlap paging in the model with the backend import and server startup
+        threading.Thread(target=prewarm_model, args=(model_path,), daemon=True).start()
     
     # Force llama-cpp backend since we're using a GGUF model
-    env['DEFAULT_LLM_BACKEND'] = 'llamacpp'
-    # Update current process environment so backend can read these
-    os.environ['DEFAULT_LLM_BACKEND'] = env['DEFAULT_LLM_BACKEND']
-    if 'LLAMA_CPP_MODEL_PATH' in env:
-        os.environ['LLAMA_CPP_MODEL_PATH'] = env['LLAMA_CPP_MODEL_PATH']
+    os.environ['DEFAULT_LLM_BACKEND'] = 'llamacpp'
     
-    # Check Ollama availability
-    ollama_available = check_ollama_available()
-    if not ollama_available:
-        logging.info("Ollama not detected - using llama-cpp backend with downloaded model")
-    else:
-        logging.info("Ollama detected but using llama-cpp for this setup")
+    # The backend is forced to llama-cpp above, so there is no need to import
+    # the ollama client or probe its server here
+    logging.info("Using llama-cpp backend with the local GGUF model")
 
     try:
-        # Import and run the backend
+        # Import the backend in the background so its (heavy) import overlaps with
+        # certificate setup; uvicorn then finds it in sys.modules via "main:app".
         # In PyInstaller onefile, avoid manipulating sys.path; rely on bundled modules.
         # Ensure 'main' is included at build time (use --hidden-import=main when building if needed).
-        try:
-            logging.info("Importing main module...")
-            from main import app  # type: ignore
-        except ModuleNotFoundError as e:
-            # Fallback for frozen apps: try dynamic import
-            logging.info(f"Direct import failed: {e}, trying dynamic import...")
-            import importlib
-            app = importlib.import_module("main").app  # type: ignore[attr-defined]
+        logging.info("Importing main module...")
+        main_import = startup_pool.submit(importlib.import_module, "main")
+        startup_pool.shutdown(wait=False)
+
+        ensure_self_signed_cert(cert_file, key_file, pending_key)
 
+        # Re-raises any ImportError from the background import
+        main_import.result()
         import uvicorn
 
         logging.info("Backend imported successfully!")
 
-        # Prepare HTTPS certificate
-        certs_dir = models_dir / "certs"
-        certs_dir.mkdir(parents=True, exist_ok=True)
-        cert_file = certs_dir / "ndk_selfsigned.crt"
-        key_file = certs_dir / "ndk_selfsigned.key"
-
-        def get_local_ip() -> str:
-            try:
-                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                s.connect(("8.8.8.8", 80))
-                ip = s.getsockname()[0]
-                s.close()
-                return ip
-            except Exception:
-                return "127.0.0.1"
-
-        def ensure_self_signed_cert():
-            try:
-                if cert_file.exists() and key_file.exists():
+        # No per-request access log, and log_config=None so uvicorn's records go
+        # through the queued handlers from setup_logging; uvicorn's default loop
+        # and http settings already pick uvloop/httptools when installed. A single
+        # process: sessions live in this process's memory.
+        server_options = dict(
+            host="0.0.0.0",
+            access_log=False,
+            log_config=None,
+        )
+        https_config = uvicorn.Config(
+            "main:app",
+            port=8443,
+            ssl_certfile=str(cert_file),
+            ssl_keyfile=str(key_file),
+            # When the HTTP server runs, it runs the app's startup/shutdown hooks
+            lifespan="auto" if https_only else "off",
+            **server_options,
+        )
+        servers = [uvicorn.Server(https_config)]
+        if not https_only:
+            # Serve HTTP and HTTPS from one event loop and one copy of the app
+            http_config = uvicorn.Config("main:app", port=8000, **server_options)
+            servers.insert(0, uvicorn.Server(http_config))
+        for server in servers:
+            # Each server would claim SIGINT/SIGTERM for itself and only the last
+            # one would stop; the handler below stops both
+            server.install_signal_handlers = lambda: None
+
+        def stop_servers(signum, frame):
+            for server in servers:
+                # A second Ctrl+C skips waiting for open connections
+                if server.should_exit:
+                    server.force_exit = True
+                server.should_exit = True
+
+        signal.signal(signal.SIGINT, stop_servers)
+        signal.signal(signal.SIGTERM, stop_servers)
+
+        async def announce_ready():
+            # Server.started flips once startup has run and the socket is bound
+            while not all(server.started for server in servers):
+                if any(server.should_exit for server in servers):
                     return
-                logging.info("Generating self-signed certificate for HTTPS...")
-                key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-                subject = issuer = x509.Name([
-                    x509.NameAttribute(NameOID.COUNTRY_NAME, u"US"),
-                    x509.NameAttribute(NameOID.ORGANIZATION_NAME, u"NDK Tracker"),
-                    x509.NameAttribute(NameOID.COMMON_NAME, u"NDK Local"),
-                ])
-                alt_names = [
-                    x509.DNSName(u"localhost"),
-                ]
-                # Add local IP as IP SAN
-                local_ip = get_local_ip()
-                try:
-                    alt_names.append(x509.IPAddress(ipaddress.ip_address(local_ip)))
-                except Exception:
-                    pass
-                san = x509.SubjectAlternativeName(alt_names)
-                cert = (
-                    x509.CertificateBuilder()
-                    .subject_name(subject)
-                    .issuer_name(issuer)
-                    .public_key(key.public_key())
-                    .serial_number(x509.random_serial_number())
-                    .not_valid_before(datetime.utcnow() - timedelta(minutes=1))
-                    .not_valid_after(datetime.utcnow() + timedelta(days=3650))
-                    .add_extension(san, critical=False)
-                    .sign(key, hashes.SHA256())
-                )
-                with open(key_file, "wb") as f:
-                    f.write(
-                        key.private_bytes(
-                            encoding=serialization.Encoding.PEM,
-                            format=serialization.PrivateFormat.TraditionalOpenSSL,
-                            encryption_algorithm=serialization.NoEncryption(),
-                        )
-                    )
-                with open(cert_file, "wb") as f:
-                    f.write(cert.public_bytes(serialization.Encoding.PEM))
-                logging.info(f"Self-signed cert generated at {certs_dir}")
-            except Exception:
-                logging.error("Failed to create self-signed cert:")
-                logging.error(traceback.format_exc())
-
-        ensure_self_signed_cert()
-
-        print("Backend started successfully!")
-        print("Access the API at: http://localhost:8000 (HTTP)")
-        print("Also available at: https://<your-ip>:8443 (HTTPS, self-signed)")
-        print("Press Ctrl+C to stop")
-        print(f"Logs are saved to: {log_file}")
-
-        # Run HTTP and HTTPS servers in parallel
-        def run_http():
-            uvicorn.run(app, host="0.0.0.0", port=8000)
-
-        def run_https():
-            uvicorn.run(
-                app,
-                host="0.0.0.0",
-                port=8443,
-                ssl_certfile=str(cert_file),
-                ssl_keyfile=str(key_file),
-            )
-
-        with ThreadPoolExecutor(max_workers=2) as pool:
-            pool.submit(run_http)
-            run_https()
+                await asyncio.sleep(0.05)
+            print("Backend started successfully!")
+            if https_only:
+                print("Access the API at: https://<your-ip>:8443 (HTTPS, self-signed)")
+            else:
+                print("Access the API at: http://localhost:8000 (HTTP)")
+                print("Also available at: https://<your-ip>:8443 (HTTPS, self-signed)")
+            print("Press Ctrl+C to stop")
+            print(f"Logs are saved to: {log_file}")
+
+        async def serve_all():
+            ready = asyncio.create_task(announce_ready())
+            await asyncio.gather(*(server.serve() for server in servers))
+            ready.cancel()
+
+        https_config.setup_event_loop()
+        asyncio.run(serve_all())
 
     except ImportError as e:
+        import traceback
         error_msg = f"Error importing backend: {e}"
         logging.error(error_msg)
         logging.error(traceback.format_exc())
         print(error_msg)
         print("Make sure all dependencies are installed")
-        input("Press Enter to continue...")
+        pause_on_error()
         return False
     except Exception as e:
+        import traceback
         error_msg = f"Error starting backend: {e}"
         logging.error(error_msg)
         logging.error(traceback.format_exc())
         print(error_msg)
         print(f"Full error details saved to: {log_file}")
-        input("Press Enter to continue...")
+        pause_on_error()
         return False
 
 def main():
-    parser = argparse.ArgumentParser(description="Minimal NDK Tracker Setup")
+    parser = argparse.ArgumentParser(description=f"Minimal {APP_NAME} Setup")
     parser.add_argument("--models-dir", type=str, default="./models",
                        help="Directory to store models")
     parser.add_argument("--skip-download", action="store_true",
                        help="Skip model download if already exists")
+    parser.add_argument("--https-only", action="store_true",
+                       help="Serve only HTTPS on port 8443 (no plain HTTP on 8000)")
 
     args = parser.parse_args()
 
     models_dir = Path(args.models_dir).absolute()
 
-    print("=== NDK Tracker Minimal Setup ===")
+    print(f"=== {APP_NAME} Minimal Setup ===")
     print(f"Models directory: {models_dir}")
 
     # If a model already exists in common paths, skip download.
     existing_model = find_existing_model(models_dir)
+    if existing_model and not check_existing_model(existing_model):
+        print(f"Existing model failed its integrity check, downloading it again: {existing_model}")
+        existing_model.unlink()
+        find_existing_model.cache_clear()
+        existing_model = None
     if existing_model:
         print(f"Using existing model at: {existing_model}")
     else:
@@ -347,7 +482,8 @@ def main():
             print("--skip-download provided and no model found; backend may fail to start without a model.")
 
     # Start backend
-    start_backend(models_dir)
+    if start_backend(models_dir, existing_model, https_only=args.https_only) is False:
+        return 1
 
     return 0
 
@@ -4,10 +4,11 @@ Script to download and set up GGUF models for llama.cpp integration
 """
 
 import os
-import requests
 from pathlib import Path
 import argparse
 
+from downloader import download_file
+
 # Popular GGUF model URLs (these are examples - replace with actual URLs)
 MODEL_URLS = {
     "llama2-7b": {
@@ -47,29 +48,14 @@ def download_model(model_name: str, models_dir: Path):
         # Create models directory
         models_dir.mkdir(exist_ok=True)
         
-        # Download with progress
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-        
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        print(f"\rProgress: {progress:.1f}%", end='', flush=True)
-        
-        print(f"\nDownloaded {filename} successfully")
+        # 1 MiB reads, parallel ranges and resume from <file>.part on a retry
+        download_file(url, filepath)
+        print(f"Downloaded {filename} successfully")
         return True
         
     except Exception as e:
+        # The .part file is kept so the next run picks up where this one stopped
         print(f"Error downloading {model_name}: {e}")
-        if filepath.exists():
-            filepath.unlink()  # Remove incomplete file
         return False
 
 def list_models(models_dir: Path):
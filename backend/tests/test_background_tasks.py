@@ -0,0 +1,36 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+class BackgroundTasksTest(unittest.TestCase):
+    def test_tasks_are_kept_and_cancelled_on_shutdown(self):
+        with TestClient(main.app):
+            sweeper = main.app.state.session_sweeper
+            qr_prewarm = main.app.state.qr_prewarm
+            self.assertIsNotNone(sweeper)
+            self.assertIsNotNone(qr_prewarm)
+            self.assertFalse(sweeper.done())
+
+        self.assertTrue(sweeper.cancelled())
+        self.assertTrue(qr_prewarm.done())
+        self.assertIsNone(main.app.state.session_sweeper)
+        self.assertIsNone(main.app.state.qr_prewarm)
+
+    def test_sweeper_starts_again_after_restart(self):
+        with TestClient(main.app):
+            first = main.app.state.session_sweeper
+        with TestClient(main.app):
+            second = main.app.state.session_sweeper
+            self.assertIsNot(first, second)
+            self.assertFalse(second.done())
+
+
+if __name__ == "__main__":
+    unittest.main()
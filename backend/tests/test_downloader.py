@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import downloader
+
+DATA = os.urandom(256 * 1024)
+DATA_SHA256 = hashlib.sha256(DATA).hexdigest()
+
+
+class FileServer:
+    """Serves DATA, with switches for how Range requests are (mis)handled"""
+
+    def __init__(self):
+        self.advertise_ranges = True
+        self.honor_ranges = True
+        # Cut plain 200 bodies off halfway
+        self.truncate_full_body = False
+        self.requested_ranges = []
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        headers = {"ETag": '"v1"'}
+        if self.advertise_ranges:
+            headers["Accept-Ranges"] = "bytes"
+        if request.method == "HEAD":
+            return web.Response(headers={**headers, "Content-Length": str(len(DATA))})
+
+        range_header = request.headers.get("Range")
+        self.requested_ranges.append(range_header)
+        if range_header and self.honor_ranges:
+            start, end = (int(x) for x in range_header.split("=")[1].split("-"))
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(DATA)}"
+            return web.Response(status=206, body=DATA[start:end + 1], headers=headers)
+
+        if self.truncate_full_body:
+            response = web.StreamResponse(headers=headers)
+            response.content_length = len(DATA)
+            await response.prepare(request)
+            await response.write(DATA[:len(DATA) // 2])
+            request.transport.close()
+            return response
+        return web.Response(body=DATA, headers=headers)
+
+
+class DownloaderTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.files = FileServer()
+        app = web.Application()
+        app.router.add_route("*", "/model.gguf", self.files.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+        self.url = str(self.server.make_url("/model.gguf"))
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.target = Path(tmp.name) / "model.gguf"
+        self.part = self.target.with_name(self.target.name + ".part")
+        self.state_path = downloader._state_path(self.part)
+
+        for name, value in (("MIN_SPLIT_SIZE", 0), ("RETRY_BACKOFF", 0), ("MAX_RETRIES", 1)):
+            patcher = mock.patch.object(downloader, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def download(self, sha256=DATA_SHA256, connections=4):
+        with mock.patch("builtins.print"):
+            await downloader._download(self.url, self.target, connections, sha256)
+
+    def assert_committed(self):
+        self.assertEqual(self.target.read_bytes(), DATA)
+        self.assertFalse(self.part.exists())
+        self.assertFalse(self.state_path.exists())
+        self.assertTrue(downloader.verify_fingerprint(self.target))
+
+    async def test_parallel_ranges(self):
+        await self.download()
+
+        self.assert_committed()
+        self.assertEqual(len(self.files.requested_ranges), 4)
+
+    async def test_resume_fetches_only_missing_ranges(self):
+        half = len(DATA) // 2
+        state = downloader._ResumeState(self.state_path, self.url, len(DATA), '"v1"',
+                                        downloader._split(len(DATA), 2))
+        state.ranges[0][2] = half
+        state.save()
+        self.part.write_bytes(DATA[:half] + b"\0" * (len(DATA) - half))
+
+        await self.download()
+
+        self.assert_committed()
+        self.assertEqual(self.files.requested_ranges, [f"bytes={half}-{len(DATA) - 1}"])
+
+    async def test_changed_remote_file_restarts(self):
+        state = downloader._ResumeState(self.state_path, self.url, len(DATA), '"v0"',
+                                        downloader._split(len(DATA), 1))
+        state.ranges[0][2] = len(DATA) // 2
+        state.save()
+        self.part.write_bytes(b"\1" * len(DATA))
+
+        await self.download()
+
+        self.assert_committed()
+        self.assertIn(f"bytes=0-{len(DATA) // 4 - 1}", self.files.requested_ranges)
+
+    async def test_falls_back_to_single_stream(self):
+        self.files.honor_ranges = False
+
+        await self.download()
+
+        self.assert_committed()
+
+    async def test_interrupted_fallback_leaves_no_range_state(self):
+        self.files.honor_ranges = False
+        self.files.truncate_full_body = True
+
+        with self.assertRaises(Exception):
+            await self.download()
+        self.assertFalse(self.state_path.exists())
+        self.assertFalse(self.target.exists())
+
+        # Next run, with a well-behaved server, starts over instead of trusting
+        # the zeroed bytes the fallback left behind
+        self.files.honor_ranges = True
+        self.files.truncate_full_body = False
+        self.files.requested_ranges.clear()
+        await self.download(sha256=None)
+
+        self.assert_committed()
+        self.assertIn(f"bytes=0-{len(DATA) // 4 - 1}", self.files.requested_ranges)
+
+    async def test_single_stream_discards_stale_range_state(self):
+        self.files.advertise_ranges = False
+        state = downloader._ResumeState(self.state_path, self.url, len(DATA), '"v1"',
+                                        downloader._split(len(DATA), 1))
+        state.save()
+        self.part.write_bytes(b"\0" * len(DATA))
+        self.files.truncate_full_body = True
+
+        with self.assertRaises(Exception):
+            await self.download()
+        self.assertFalse(self.state_path.exists())
+
+    async def test_remote_size(self):
+        self.assertEqual(await asyncio.to_thread(downloader.remote_size, self.url), len(DATA))
+        missing = str(self.server.make_url("/missing.gguf"))
+        self.assertIsNone(await asyncio.to_thread(downloader.remote_size, missing))
+
+    async def test_sha256_mismatch_is_not_committed(self):
+        with self.assertRaises(IOError):
+            await self.download(sha256="0" * 64)
+
+        self.assertFalse(self.target.exists())
+        self.assertFalse(self.part.exists())
+        self.assertFalse(self.state_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
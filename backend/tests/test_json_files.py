@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+
+
+class JsonFileCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "settings.json"
+        self.addCleanup(main._json_file_cache.pop, self.path, None)
+
+    async def test_same_size_rewrite_within_one_mtime_tick(self):
+        await main._awrite_json(self.path, {"theme": "dark"})
+        self.assertEqual(await main._aread_json_cached(self.path), {"theme": "dark"})
+        stamp = self.path.stat().st_mtime_ns
+
+        await main._awrite_json(self.path, {"theme": "blue"})
+        # Coarse mtime: the rewrite lands in the same tick as the first write
+        os.utime(self.path, ns=(stamp, stamp))
+
+        self.assertEqual(await main._aread_json_cached(self.path), {"theme": "blue"})
+
+    async def test_cached_value_is_independent_of_the_written_object(self):
+        settings = {"reminders": ["08:00"]}
+        await main._awrite_json(self.path, settings)
+        settings["reminders"].append("20:00")
+
+        self.assertEqual(await main._aread_json_cached(self.path), {"reminders": ["08:00"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
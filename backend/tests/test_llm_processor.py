@@ -0,0 +1,137 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.llm = main.llm_processor
+        self.llm._exact_cache.clear()
+        self.addCleanup(self.llm._exact_cache.clear)
+
+    def test_hit_returns_a_copy(self):
+        self.llm._cache_store("ate lunch", {"extracted_data": {"food": ["lunch"]}})
+        first = self.llm._cache_lookup("ate lunch")
+        first["extracted_data"]["food"].clear()
+        self.assertEqual(self.llm._cache_lookup("ate lunch"), {"extracted_data": {"food": ["lunch"]}})
+
+    def test_evicts_least_recently_used(self):
+        with mock.patch.object(main, "RESPONSE_CACHE_SIZE", 2):
+            self.llm._cache_store("a", {"extracted_data": {}, "n": 1})
+            self.llm._cache_store("b", {"extracted_data": {}, "n": 2})
+            self.llm._cache_lookup("a")
+            self.llm._cache_store("c", {"extracted_data": {}, "n": 3})
+        self.assertIsNone(self.llm._cache_lookup("b"))
+        self.assertEqual(self.llm._cache_lookup("a"), {"extracted_data": {}, "n": 1})
+
+    def test_malformed_results_are_not_cached(self):
+        self.llm._cache_store("ate pasta", {"food": ["pasta"]})
+        self.llm._cache_store("ate rice", {"extracted_data": ["rice"]})
+        self.llm._parse_llm_response('{"extracted_data": {"food": ["x"]},}', "ate beans")
+        self.assertIsNone(self.llm._cache_lookup("ate pasta"))
+        self.assertIsNone(self.llm._cache_lookup("ate rice"))
+        self.assertIsNone(self.llm._cache_lookup("ate beans"))
+
+    def test_lookup_races_with_eviction_on_another_thread(self):
+        errors = []
+        done = threading.Event()
+
+        def store():
+            for i in range(20000):
+                self.llm._cache_store(str(i % 8), {"extracted_data": {}, "n": i})
+            done.set()
+
+        def lookup():
+            try:
+                while not done.is_set():
+                    for i in range(8):
+                        self.llm._cache_lookup(str(i))
+            except Exception as e:
+                errors.append(e)
+
+        # Switch threads as often as possible so the window is actually hit
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        with mock.patch.object(main, "RESPONSE_CACHE_SIZE", 4):
+            threads = [threading.Thread(target=store), threading.Thread(target=lookup)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(errors, [])
+
+
+class ExtractionPromptTest(unittest.TestCase):
+    def setUp(self):
+        self.llm = main.llm_processor
+        self.llm._exact_cache.clear()
+        self.addCleanup(self.llm._exact_cache.clear)
+
+    def test_prompt_keeps_static_prefix_and_ends_with_answer_cue(self):
+        prompt = self.llm._build_extraction_prompt("ate lunch")
+        self.assertTrue(prompt.startswith(main.EXTRACTION_PROMPT_PREFIX))
+        self.assertIn('User input: "ate lunch"', prompt)
+        self.assertTrue(prompt.endswith("JSON:"))
+
+    def test_parses_representative_completion(self):
+        # What TinyLlama produces after the cue: leading space, JSON, then chatter
+        completion = (
+            ' {\n'
+            '    "extracted_data": {\n'
+            '        "food": ["pasta for lunch"],\n'
+            '        "medication": [], "behavior": ["calm {mostly}"], "exercise": [],\n'
+            '        "water": [], "potty": [], "school": []\n'
+            '    },\n'
+            '    "missing_info": ["amount eaten"],\n'
+            '    "clarification_question": "How much pasta did they eat?",\n'
+            '    "confidence": 0.8\n'
+            '}\n'
+            'Let me know if you need anything else!'
+        )
+        result = self.llm._parse_llm_response(completion, "ate pasta for lunch, calm mostly")
+        self.assertEqual(result["extracted_data"]["food"], ["pasta for lunch"])
+        self.assertEqual(result["extracted_data"]["behavior"], ["calm {mostly}"])
+        self.assertEqual(result["clarification_question"], "How much pasta did they eat?")
+        self.assertEqual(self.llm._cache_lookup("ate pasta for lunch, calm mostly"), result)
+
+    def test_completion_without_json_falls_back_to_keywords(self):
+        result = self.llm._parse_llm_response('User input: "ate lunch"', "ate lunch")
+        self.assertEqual(result["extracted_data"]["food"], ["ate lunch"])
+        self.assertEqual(result["confidence"], 0.6)
+
+
+class ExtractJsonObjectTest(unittest.TestCase):
+    # Trailing comma, as small models often emit; the nested dict must not be returned
+    TRAILING_COMMA = '{"extracted_data": {"food": ["pasta"], "medication": []}, "confidence": 0.8,}'
+
+    def setUp(self):
+        main.llm_processor._exact_cache.clear()
+        self.addCleanup(main.llm_processor._exact_cache.clear)
+
+    def test_invalid_outer_object_is_skipped_whole(self):
+        self.assertIsNone(main._extract_json_object(self.TRAILING_COMMA))
+
+    def test_later_block_after_invalid_one_still_parses(self):
+        text = 'Here {is} the result: {"extracted_data": {"food": []}}'
+        self.assertEqual(main._extract_json_object(text), {"extracted_data": {"food": []}})
+
+    def test_invalid_outer_object_falls_back_to_keywords(self):
+        result = main.llm_processor._parse_llm_response(self.TRAILING_COMMA, "ate pasta")
+        self.assertEqual(result["extracted_data"]["food"], ["ate pasta"])
+        self.assertEqual(result["confidence"], 0.6)
+
+    def test_object_without_extracted_data_falls_back_to_keywords(self):
+        result = main.llm_processor._parse_llm_response('{"food": ["pasta"]}', "ate pasta")
+        self.assertIsInstance(result["extracted_data"], dict)
+        self.assertEqual(result["confidence"], 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
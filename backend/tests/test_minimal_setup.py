@@ -0,0 +1,166 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import minimal_setup
+from downloader import write_fingerprint
+
+
+class ExistingModelIntegrityTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.models_dir = Path(self.tmp.name)
+        self.model = self.models_dir / minimal_setup.MINIMAL_MODEL["filename"]
+        minimal_setup.find_existing_model.cache_clear()
+        self.addCleanup(minimal_setup.find_existing_model.cache_clear)
+        self.addCleanup(self.tmp.cleanup)
+        env = mock.patch.dict(os.environ)
+        env.start()
+        os.environ.pop("LLAMA_CPP_MODEL_PATH", None)
+        self.addCleanup(env.stop)
+
+    def run_main(self):
+        argv = ["minimal_setup.py", "--models-dir", str(self.models_dir)]
+        with mock.patch.object(sys, "argv", argv), \
+             mock.patch.object(minimal_setup, "download_minimal_model", return_value=True) as download, \
+             mock.patch.object(minimal_setup, "start_backend", return_value=None) as start:
+            self.assertEqual(minimal_setup.main(), 0)
+        return download, start
+
+    def test_truncated_model_is_downloaded_again(self):
+        self.model.write_bytes(b"GGUF" + b"\0" * 4096)
+        write_fingerprint(self.model)
+        # Simulate an interrupted copy: shorter than the recorded size
+        with open(self.model, "r+b") as f:
+            f.truncate(1024)
+
+        download, start = self.run_main()
+
+        self.assertFalse(self.model.exists())
+        download.assert_called_once_with(self.models_dir.absolute())
+        self.assertIsNone(start.call_args.args[1])
+
+    def test_mismatched_fingerprint_is_downloaded_again(self):
+        self.model.write_bytes(b"GGUF" + b"\0" * 4096)
+        write_fingerprint(self.model)
+        self.model.write_bytes(b"GGUF" + b"\1" * 4096)
+
+        download, _ = self.run_main()
+
+        self.assertFalse(self.model.exists())
+        download.assert_called_once()
+
+    def test_legacy_model_shorter_than_remote_is_downloaded_again(self):
+        # Written by the old downloader: no fingerprint sidecar
+        self.model.write_bytes(b"GGUF" + b"\0" * 1024)
+
+        with mock.patch.object(minimal_setup, "remote_size", return_value=4096) as size:
+            download, start = self.run_main()
+
+        size.assert_called_once_with(minimal_setup.MINIMAL_MODEL["url"])
+        self.assertFalse(self.model.exists())
+        download.assert_called_once()
+        self.assertIsNone(start.call_args.args[1])
+
+    def test_legacy_model_with_remote_size_is_fingerprinted(self):
+        self.model.write_bytes(b"GGUF" + b"\0" * 1024)
+
+        with mock.patch.object(minimal_setup, "remote_size", return_value=1028):
+            download, _ = self.run_main()
+
+        download.assert_not_called()
+        self.assertTrue(minimal_setup.verify_fingerprint(self.model))
+
+    def test_legacy_model_is_used_when_size_is_unknown(self):
+        self.model.write_bytes(b"GGUF" + b"\0" * 1024)
+
+        with mock.patch.object(minimal_setup, "remote_size", return_value=None):
+            download, _ = self.run_main()
+
+        download.assert_not_called()
+        self.assertTrue(self.model.exists())
+        self.assertIsNone(minimal_setup.verify_fingerprint(self.model))
+
+    def test_intact_model_is_used(self):
+        self.model.write_bytes(b"GGUF" + b"\0" * 4096)
+        write_fingerprint(self.model)
+
+        download, start = self.run_main()
+
+        download.assert_not_called()
+        self.assertEqual(start.call_args.args[1], self.model.absolute())
+
+
+class FindExistingModelTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        minimal_setup.find_existing_model.cache_clear()
+        self.addCleanup(minimal_setup.find_existing_model.cache_clear)
+        env = mock.patch.dict(os.environ)
+        env.start()
+        os.environ.pop("LLAMA_CPP_MODEL_PATH", None)
+        self.addCleanup(env.stop)
+
+    def test_unreadable_candidate_falls_back_to_scan(self):
+        models_dir = Path(self.tmp.name)
+        alternative = models_dir / "other.gguf"
+        alternative.write_bytes(b"GGUF")
+        real_is_file = Path.is_file
+
+        def is_file(path):
+            if path.name == minimal_setup.MINIMAL_MODEL["filename"]:
+                raise PermissionError(13, "Permission denied", str(path))
+            return real_is_file(path)
+
+        with mock.patch.object(Path, "is_file", is_file):
+            found = minimal_setup.find_existing_model(models_dir)
+        self.assertEqual(found, alternative)
+
+    def test_unreadable_models_dir_finds_nothing(self):
+        models_dir = Path(self.tmp.name) / "models"
+        with mock.patch.object(Path, "is_file", side_effect=PermissionError(13, "Permission denied")), \
+             mock.patch.object(minimal_setup.os, "scandir", side_effect=PermissionError(13, "Permission denied")):
+            self.assertIsNone(minimal_setup.find_existing_model(models_dir))
+
+
+class LocalAddressTest(unittest.TestCase):
+    def setUp(self):
+        cache = mock.patch.object(minimal_setup, "_LAN_IP_CACHE", None)
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def test_route_address_wins_over_hostname(self):
+        with mock.patch.object(minimal_setup, "_route_ip", return_value="192.168.1.20"), \
+             mock.patch.object(minimal_setup, "_hostname_ips", return_value=["172.17.0.1"]):
+            self.assertEqual(minimal_setup.get_local_ip(), "192.168.1.20")
+
+    def test_hostname_is_used_when_offline(self):
+        with mock.patch.object(minimal_setup, "_route_ip", return_value=None), \
+             mock.patch.object(minimal_setup, "_hostname_ips", return_value=["10.0.0.5"]):
+            self.assertEqual(minimal_setup.get_local_ip(), "10.0.0.5")
+
+    def test_certificate_covers_route_and_hostname_addresses(self):
+        from cryptography import x509
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cert_file, key_file = Path(tmp) / "cert.pem", Path(tmp) / "key.pem"
+            with mock.patch.object(minimal_setup, "_route_ip", return_value="192.168.1.20"), \
+                 mock.patch.object(minimal_setup, "_hostname_ips", return_value=["172.17.0.1", "192.168.1.20"]):
+                minimal_setup.ensure_self_signed_cert(cert_file, key_file)
+            cert = x509.load_pem_x509_certificate(cert_file.read_bytes())
+
+        san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+        self.assertEqual(
+            [str(ip) for ip in san.get_values_for_type(x509.IPAddress)],
+            ["192.168.1.20", "172.17.0.1"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+class SessionSaveTest(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app, raise_server_exceptions=False)
+        self.addCleanup(main.active_sessions.clear)
+        self.addCleanup(main._session_last_seen.clear)
+
+    def start_session(self) -> str:
+        response = self.client.post("/input/log", json={"message": "ate lunch"})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["session_id"]
+
+    def test_failed_save_keeps_the_session_for_a_retry(self):
+        session_id = self.start_session()
+
+        with mock.patch.object(main.DataManager, "save_session", side_effect=OSError("disk full")):
+            response = self.client.post("/input/save_session", json={"session_id": session_id})
+        self.assertEqual(response.status_code, 500)
+        self.assertIn(session_id, main.active_sessions)
+        self.assertIn(session_id, main._session_last_seen)
+
+        with mock.patch.object(main.DataManager, "save_session", return_value="saved.json") as save:
+            response = self.client.post("/input/save_session", json={"session_id": session_id})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(session_id, main.active_sessions)
+        stored = save.call_args.args[0]
+        self.assertEqual(stored["status"], "completed")
+        self.assertEqual(stored["raw_text_aggregate"], "ate lunch")
+        self.assertNotIn("raw_text_chunks", stored)
+
+
+class SessionSweeperTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.addCleanup(main.active_sessions.clear)
+        self.addCleanup(main._session_last_seen.clear)
+        for name in ("SESSION_TTL", "SESSION_SWEEP_INTERVAL"):
+            patcher = mock.patch.object(main, name, 0)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        with mock.patch("builtins.print"):
+            main._record_entry(main.LogEntry(message="ate lunch"), "s1",
+                               main.llm_processor._fallback_processing("ate lunch"))
+
+    async def sweep_briefly(self):
+        sweeper = asyncio.create_task(main._sweep_stale_sessions())
+        await asyncio.sleep(0.1)
+        sweeper.cancel()
+        await asyncio.gather(sweeper, return_exceptions=True)
+
+    async def test_expired_session_is_kept_when_its_save_fails(self):
+        with mock.patch.object(main.DataManager, "save_session", side_effect=OSError("disk full")), \
+             mock.patch("builtins.print"):
+            await self.sweep_briefly()
+        self.assertIn("s1", main.active_sessions)
+        self.assertIn("s1", main._session_last_seen)
+
+        with mock.patch.object(main.DataManager, "save_session", return_value="saved.json") as save:
+            await self.sweep_briefly()
+        self.assertNotIn("s1", main.active_sessions)
+        self.assertEqual(save.call_args.args[0]["status"], "expired")
+
+
+if __name__ == "__main__":
+    unittest.main()